@@ -15,16 +15,31 @@ Collects: hardware inventory, system metrics (sysstat/sadf 24h),
 """
 
 import argparse
+import asyncio
+import concurrent.futures
 import csv
+import functools
 import json
 import logging
 import os
 import re
 import subprocess
 import sys
+import threading
+from collections import defaultdict
 from datetime import datetime, timedelta
 from pathlib import Path
 
+# orjson parses JSON in C, 2-3x faster than the stdlib on vnstat/lscpu
+# payloads; it stays optional so the tool keeps its stdlib-only baseline.
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so the existing
+# error handling works with either parser.
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
 # ---------------------------------------------------------------------------
 # Constants
 # ---------------------------------------------------------------------------
@@ -37,44 +52,57 @@ LOG_RETENTION_DAYS = 1
 
 REQUIRED_PACKAGES = ["sysstat", "vnstat", "nethogs", "lshw", "dmidecode"]
 
+# Compiled once at import; runs inside the per-line nethogs loop.
+# nethogs -t line: /path/to/binary/PID/UID\tSENT\tRECEIVED
+# re.ASCII keeps \d to 0-9 instead of the full Unicode digit property
+_NETHOGS_RE = re.compile(r"^.*/(\d+)/\d+\t([^\t]+)\t([^\t]+)$", re.ASCII)
+
 # ---------------------------------------------------------------------------
 # Logging
 # ---------------------------------------------------------------------------
 def setup_logging(verbose: bool = False) -> None:
-    """Configure structured logging to file and optionally to stderr."""
+    """
+    Configure structured logging to file and optionally to stderr.
+
+    The log file is the only thing written synchronously in the hot path,
+    so records below the effective level must be rejected before any
+    formatting work: the level is set explicitly on the root logger, and
+    call sites use lazy %s interpolation (never f-strings) so message
+    arguments are only stringified for records that will actually be
+    emitted.
+    """
     LOG_DIR.mkdir(parents=True, exist_ok=True)
     handlers = [logging.FileHandler(LOG_FILE, encoding="utf-8")]
     if verbose:
         handlers.append(logging.StreamHandler(sys.stderr))
+    level = logging.DEBUG if verbose else logging.INFO
     logging.basicConfig(
-        level=logging.DEBUG if verbose else logging.INFO,
+        level=level,
         format="%(asctime)s | %(levelname)-7s | %(funcName)s | %(message)s",
         datefmt="%Y-%m-%d %H:%M:%S",
         handlers=handlers,
     )
+    # basicConfig is a no-op if logging was already configured (e.g. by an
+    # importing test harness); make the level stick regardless.
+    logging.getLogger().setLevel(level)
 
 # ---------------------------------------------------------------------------
 # Safe command execution
 # ---------------------------------------------------------------------------
-def run_cmd(cmd, timeout: int = 60, check: bool = False) -> subprocess.CompletedProcess:
+def run_cmd(cmd: list[str], timeout: int = 60, check: bool = False) -> subprocess.CompletedProcess:
     """
-    Execute a command safely.
+    Execute a command safely as an argv list — never through a shell.
 
-    - list argument  → shell=False (safe, no injection)
-    - string argument → shell=True  (needed for pipes, awk, sed, grep)
+    Every caller passes a list; pipelines that used to go through a shell
+    have been replaced by direct file reads or Python-side parsing, which
+    also saves the extra /bin/sh fork per call.
 
     Returns CompletedProcess. On failure returns a dummy with empty stdout
     unless check=True, which raises.
     """
-    if isinstance(cmd, list):
-        shell = False
-    else:
-        shell = True
-
     try:
         result = subprocess.run(
             cmd,
-            shell=shell,
             capture_output=True,
             text=True,
             timeout=timeout,
@@ -98,57 +126,190 @@ def run_cmd_stdout(cmd, timeout: int = 60, check: bool = False) -> str:
     """Convenience: run command, return stripped stdout."""
     return run_cmd(cmd, timeout=timeout, check=check).stdout.strip()
 
+
+def run_cmd_lines(cmd: list[str], timeout: int = 60):
+    """
+    Run a command and yield its stdout line by line (without trailing newline).
+
+    Unlike run_cmd, the child's output is consumed as it is produced rather
+    than buffered into one large string, so parsing overlaps with the child
+    still running. A watchdog timer kills the child if it exceeds `timeout`.
+    """
+    try:
+        proc = subprocess.Popen(
+            cmd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+        )
+    except FileNotFoundError:
+        logging.error("Command not found: %s", cmd)
+        return
+    watchdog = threading.Timer(timeout, proc.kill)
+    watchdog.start()
+    try:
+        for line in proc.stdout:
+            yield line.rstrip("\n")
+    finally:
+        watchdog.cancel()
+        proc.stdout.close()
+        if proc.wait() < 0:
+            logging.error("Command killed (timeout %ds): %s", timeout, cmd)
+
+
+async def run_cmd_lines_async(cmd: list[str], handler, timeout: int = 60) -> None:
+    """
+    Run a command and feed each stdout line to `handler` as it arrives.
+
+    Async counterpart of run_cmd_lines for overlapping several slow,
+    independent commands (e.g. pidstat sampling while nethogs captures)
+    with asyncio.gather while still parsing their output streamingly.
+    """
+    try:
+        proc = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+        )
+    except FileNotFoundError:
+        logging.error("Command not found: %s", cmd)
+        return
+
+    async def _consume():
+        async for raw in proc.stdout:
+            handler(raw.decode(errors="replace").rstrip("\n"))
+
+    try:
+        await asyncio.wait_for(_consume(), timeout=timeout)
+    except asyncio.TimeoutError:
+        logging.error("Command timed out (%ds): %s", timeout, cmd)
+        proc.kill()
+    finally:
+        await proc.wait()
+
+
+async def run_cmd_async(cmd: list[str], timeout: int = 60) -> str:
+    """
+    Run a command without a shell and return its stripped stdout.
+
+    Async variant of run_cmd_stdout for fanning out many independent
+    commands with asyncio.gather so their fork/exec latencies overlap.
+    """
+    try:
+        proc = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        stdout, _ = await asyncio.wait_for(proc.communicate(), timeout=timeout)
+        return stdout.decode(errors="replace").strip()
+    except asyncio.TimeoutError:
+        logging.error("Command timed out (%ds): %s", timeout, cmd)
+        proc.kill()
+        # Reap the killed child before the event loop shuts down
+        await proc.wait()
+        return ""
+    except FileNotFoundError:
+        logging.error("Command not found: %s", cmd)
+        return ""
+
 # ---------------------------------------------------------------------------
 # Interface detection
 # ---------------------------------------------------------------------------
+@functools.lru_cache(maxsize=1)
 def get_main_interface() -> str:
-    """Detect the primary network interface via default route."""
-    out = run_cmd_stdout(["ip", "route", "get", "8.8.8.8"])
-    match = re.search(r"dev\s+(\S+)", out)
-    if match:
-        iface = match.group(1)
-        logging.info("Detected primary interface: %s", iface)
-        return iface
-    # Fallback: first non-lo interface
-    out2 = run_cmd_stdout("ip -o link show up | awk -F': ' '{print $2}' | grep -v lo | head -1")
-    if out2:
-        logging.warning("Default route detection failed; falling back to: %s", out2)
-        return out2
+    """
+    Detect the primary network interface via default route.
+
+    Cached for the lifetime of the process: the interface cannot change
+    mid-run and every uncached call forks `ip route get`.
+    """
+    # -j gives structured JSON (iproute2 4.x+, on both 22.04 and 24.04);
+    # no regex over the human-readable output needed
+    out = run_cmd_stdout(["ip", "-j", "route", "get", "8.8.8.8"])
+    if out:
+        try:
+            iface = _json_loads(out)[0]["dev"]
+            logging.info("Detected primary interface: %s", iface)
+            return iface
+        except (json.JSONDecodeError, KeyError, IndexError) as exc:
+            logging.warning("ip -j route output parse failed: %s", exc)
+    # Fallback: first non-lo interface that is up, straight from sysfs
+    try:
+        for dev in sorted(Path("/sys/class/net").iterdir()):
+            if dev.name == "lo":
+                continue
+            try:
+                state = (dev / "operstate").read_text().strip()
+            except OSError:
+                continue
+            if state == "up":
+                logging.warning("Default route detection failed; falling back to: %s", dev.name)
+                return dev.name
+    except OSError:
+        pass
     logging.warning("No interface detected; using 'eth0' as last resort")
     return "eth0"
 
 # ---------------------------------------------------------------------------
 # Cleanup old files
 # ---------------------------------------------------------------------------
+def _is_iso_date(s: str) -> bool:
+    """Cheap shape check for a YYYY-MM-DD string (no regex, no strptime)."""
+    # isascii() first: isdigit() alone walks the Unicode digit property and
+    # accepts non-ASCII digits, which strftime never produces in filenames
+    return (len(s) == 10 and s.isascii() and s[4] == "-" and s[7] == "-"
+            and s[:4].isdigit() and s[5:7].isdigit() and s[8:10].isdigit())
+
+
 def cleanup_old_files() -> None:
     """Remove CSV files older than DATA_RETENTION_DAYS and logs older than LOG_RETENTION_DAYS."""
     now = datetime.now()
     removed = 0
 
-    # Data CSVs (date-stamped filenames)
+    # Data CSVs: filenames always end in _YYYY-MM-DD.csv, and ISO dates sort
+    # lexicographically, so a fixed-offset slice compared against one
+    # precomputed cutoff string replaces a regex search plus strptime per file.
+    cutoff_str = (now - timedelta(days=DATA_RETENTION_DAYS)).strftime("%Y-%m-%d")
     if DATA_DIR.exists():
-        for f in DATA_DIR.glob("*.csv"):
-            match = re.search(r"(\d{4}-\d{2}-\d{2})", f.name)
-            if match:
-                try:
-                    file_date = datetime.strptime(match.group(1), "%Y-%m-%d")
-                    if (now - file_date).days > DATA_RETENTION_DAYS:
-                        f.unlink()
+        with os.scandir(DATA_DIR) as it:
+            for entry in it:
+                name = entry.name
+                if not name.endswith(".csv"):
+                    continue
+                date_str = name[-14:-4]
+                if _is_iso_date(date_str):
+                    expired = date_str < cutoff_str
+                else:
+                    # Date-less files (hardware_inventory.csv) age by mtime;
+                    # normally overwritten daily so this never triggers.
+                    try:
+                        mtime = entry.stat(follow_symlinks=False).st_mtime
+                    except OSError:
+                        continue
+                    expired = (now - datetime.fromtimestamp(mtime)).days > DATA_RETENTION_DAYS
+                if expired:
+                    try:
+                        os.unlink(entry.path)
                         removed += 1
-                        logging.info("Removed old data file: %s", f.name)
-                except ValueError:
-                    pass
-
-    # Log files (by mtime)
-    for f in LOG_DIR.glob("*.log*"):
-        try:
-            age_days = (now - datetime.fromtimestamp(f.stat().st_mtime)).days
-            if age_days > LOG_RETENTION_DAYS and f != LOG_FILE:
-                f.unlink()
-                removed += 1
-                logging.info("Removed old log file: %s", f.name)
-        except OSError:
-            pass
+                        logging.info("Removed old data file: %s", name)
+                    except OSError:
+                        pass
+
+    # Log files (by mtime, reusing the stat scandir already fetched)
+    with os.scandir(LOG_DIR) as it:
+        for entry in it:
+            if ".log" not in entry.name or entry.name == LOG_FILE.name:
+                continue
+            try:
+                mtime = entry.stat(follow_symlinks=False).st_mtime
+                age_days = (now - datetime.fromtimestamp(mtime)).days
+                if age_days > LOG_RETENTION_DAYS:
+                    os.unlink(entry.path)
+                    removed += 1
+                    logging.info("Removed old log file: %s", entry.name)
+            except OSError:
+                pass
 
     if removed:
         logging.info("Cleanup complete: %d file(s) removed", removed)
@@ -174,15 +335,16 @@ def setup_environment() -> None:
     sysstat_default = Path("/etc/default/sysstat")
     if sysstat_default.exists():
         content = sysstat_default.read_text()
-        if 'ENABLED="false"' in content:
-            new_content = content.replace('ENABLED="false"', 'ENABLED="true"')
+        new_content, n = re.subn(r'ENABLED="false"', 'ENABLED="true"', content, count=1)
+        if n:
+            # Only rewrite the file when it actually changed
             sysstat_default.write_text(new_content)
             logging.info("Set ENABLED=true in /etc/default/sysstat (22.04 compat)")
 
     # Enable vnstat daemon
     run_cmd(["systemctl", "enable", "--now", "vnstat"], check=False)
 
-    # Initialize vnstat interface with --add (vnstat 2.x; -u is removed)
+    # Initialize vnstat interface with --add (vnstat 2.x dropped the legacy update flag)
     iface = get_main_interface()
     check_result = run_cmd(["vnstat", "--json", "d", "-i", iface])
     if check_result.returncode != 0:
@@ -206,15 +368,133 @@ def setup_environment() -> None:
 # ---------------------------------------------------------------------------
 # Collectors
 # ---------------------------------------------------------------------------
+def human_size(num_bytes: float) -> str:
+    """Format a byte count into human units (matches free/df -h style)."""
+    for unit in ("B", "K", "M", "G", "T", "P"):
+        if abs(num_bytes) < 1024:
+            return f"{num_bytes:.1f}{unit}" if unit != "B" else f"{int(num_bytes)}B"
+        num_bytes /= 1024
+    return f"{num_bytes:.1f}E"
+
+
+def get_memory_info() -> dict[str, str]:
+    """
+    Read MemTotal/MemAvailable/SwapTotal from /proc/meminfo.
+
+    Values in /proc/meminfo are in kB; they are converted to human units
+    in Python, replacing three separate free|awk pipelines.
+    """
+    wanted = {"MemTotal": "Total", "MemAvailable": "Available", "SwapTotal": "Swap Total"}
+    result = {}
+    try:
+        for line in Path("/proc/meminfo").read_text().splitlines():
+            key, _, rest = line.partition(":")
+            if key in wanted:
+                kb = int(rest.split()[0])
+                result[wanted[key]] = human_size(kb * 1024)
+    except (OSError, ValueError, IndexError) as exc:
+        logging.warning("Could not parse /proc/meminfo: %s", exc)
+    return result
+
+
+def get_root_disk_usage() -> dict[str, str]:
+    """Root filesystem size/used/available/use% via one statvfs syscall."""
+    try:
+        s = os.statvfs("/")
+    except OSError as exc:
+        logging.warning("statvfs on / failed: %s", exc)
+        return {}
+    total = s.f_blocks * s.f_frsize
+    used = (s.f_blocks - s.f_bfree) * s.f_frsize
+    avail = s.f_bavail * s.f_frsize
+    pct = 100 * used / total if total else 0
+    return {
+        "Root Size": human_size(total),
+        "Root Used": human_size(used),
+        "Root Available": human_size(avail),
+        "Root Use%": f"{pct:.0f}%",
+    }
+
+
+def get_block_devices() -> list[tuple[str, str]]:
+    """
+    List physical block devices with sizes from /sys/block.
+
+    The size file holds the device size in 512-byte sectors; virtual
+    devices (loop/ram/zram) are skipped, matching what `lsblk -nd` with
+    a TYPE filter used to report.
+    """
+    devices = []
+    try:
+        for dev in sorted(Path("/sys/block").iterdir()):
+            if dev.name.startswith(("loop", "ram", "zram")):
+                continue
+            try:
+                sectors = int((dev / "size").read_text())
+            except (OSError, ValueError):
+                continue
+            devices.append((dev.name, human_size(sectors * 512)))
+    except OSError as exc:
+        logging.warning("Could not list /sys/block: %s", exc)
+    return devices
+
+
+def get_dmi_info() -> tuple[str, str]:
+    """
+    Read system vendor/product from /sys/class/dmi/id.
+
+    The kernel exposes the DMI strings as plain sysfs files, so reading
+    them costs microseconds versus 20-50 ms for a root-privileged
+    dmidecode table scan. dmidecode remains as a fallback for platforms
+    without the sysfs nodes.
+    """
+    dmi_dir = Path("/sys/class/dmi/id")
+    try:
+        vendor = (dmi_dir / "sys_vendor").read_text().strip()
+        product = (dmi_dir / "product_name").read_text().strip()
+        return vendor, product
+    except OSError:
+        vendor = run_cmd_stdout(["dmidecode", "-s", "system-manufacturer"])
+        product = run_cmd_stdout(["dmidecode", "-s", "system-product-name"])
+        return vendor, product
+
+
+def get_os_pretty_name() -> str:
+    """Read PRETTY_NAME from /etc/os-release directly (no shell pipeline)."""
+    try:
+        for line in Path("/etc/os-release").read_text().splitlines():
+            if line.startswith("PRETTY_NAME="):
+                return line.split("=", 1)[1].strip().strip('"')
+    except OSError as exc:
+        logging.warning("Could not read /etc/os-release: %s", exc)
+    return ""
+
+
 def collect_hardware() -> list[list[str]]:
-    """Collect static hardware inventory: CPU, memory, disk, kernel, uptime."""
+    """
+    Collect static hardware inventory: CPU, memory, disk, kernel, uptime.
+
+    All inventory commands are independent, so they are launched together
+    with asyncio.gather and parsed in Python once everything has returned.
+    This amortizes the fork/exec cost of ~10 sequential subprocess spawns.
+    """
     rows = [["Category", "Key", "Value"]]
 
+    async def _gather():
+        return await asyncio.gather(
+            run_cmd_async(["lscpu", "--json"]),
+            run_cmd_async(["uname", "-r"]),
+            run_cmd_async(["uname", "-m"]),
+            run_cmd_async(["hostname", "-f"]),
+            run_cmd_async(["uptime", "-p"]),
+        )
+
+    lscpu_out, kernel, arch, hostname, uptime = asyncio.run(_gather())
+
     # CPU info via lscpu --json
-    out = run_cmd_stdout(["lscpu", "--json"])
-    if out:
+    if lscpu_out:
         try:
-            data = json.loads(out)
+            data = _json_loads(lscpu_out)
             for item in data.get("lscpu", []):
                 field = item.get("field", "").rstrip(":")
                 value = item.get("data", "")
@@ -223,41 +503,27 @@ def collect_hardware() -> list[list[str]]:
         except (json.JSONDecodeError, KeyError) as exc:
             logging.warning("lscpu JSON parse failed: %s", exc)
 
-    # Memory
-    mem_total = run_cmd_stdout("free -h | awk '/^Mem:/{print $2}'")
-    mem_avail = run_cmd_stdout("free -h | awk '/^Mem:/{print $7}'")
-    swap_total = run_cmd_stdout("free -h | awk '/^Swap:/{print $2}'")
-    rows.append(["Memory", "Total", mem_total])
-    rows.append(["Memory", "Available", mem_avail])
-    rows.append(["Memory", "Swap Total", swap_total])
-
-    # Disk
-    disk_out = run_cmd_stdout("df -h / | awk 'NR==2{print $2, $3, $4, $5}'")
-    if disk_out:
-        parts = disk_out.split()
-        if len(parts) >= 4:
-            rows.append(["Disk", "Root Size", parts[0]])
-            rows.append(["Disk", "Root Used", parts[1]])
-            rows.append(["Disk", "Root Available", parts[2]])
-            rows.append(["Disk", "Root Use%", parts[3]])
-
-    # Block devices
-    lsblk_out = run_cmd_stdout(["lsblk", "-nd", "-o", "NAME,SIZE,TYPE"])
-    for line in lsblk_out.splitlines():
-        parts = line.split()
-        if len(parts) >= 3 and parts[2] == "disk":
-            rows.append(["Disk", f"Block Device {parts[0]}", parts[1]])
+    # Memory: straight from /proc/meminfo, no subprocess at all
+    for key, value in get_memory_info().items():
+        rows.append(["Memory", key, value])
+
+    # Disk: one statvfs syscall instead of a df fork
+    for key, value in get_root_disk_usage().items():
+        rows.append(["Disk", key, value])
+
+    # Block devices straight from /sys/block
+    for name, size in get_block_devices():
+        rows.append(["Disk", f"Block Device {name}", size])
 
     # System info
-    rows.append(["Kernel", "Version", run_cmd_stdout(["uname", "-r"])])
-    rows.append(["Kernel", "Architecture", run_cmd_stdout(["uname", "-m"])])
-    rows.append(["System", "Hostname", run_cmd_stdout(["hostname", "-f"], check=False)])
-    rows.append(["System", "Uptime", run_cmd_stdout(["uptime", "-p"])])
-    rows.append(["System", "OS", run_cmd_stdout("cat /etc/os-release | grep PRETTY_NAME | cut -d'\"' -f2")])
+    rows.append(["Kernel", "Version", kernel])
+    rows.append(["Kernel", "Architecture", arch])
+    rows.append(["System", "Hostname", hostname])
+    rows.append(["System", "Uptime", uptime])
+    rows.append(["System", "OS", get_os_pretty_name()])
 
     # DMI info (vendor, product)
-    dmi_vendor = run_cmd_stdout(["dmidecode", "-s", "system-manufacturer"], check=False)
-    dmi_product = run_cmd_stdout(["dmidecode", "-s", "system-product-name"], check=False)
+    dmi_vendor, dmi_product = get_dmi_info()
     if dmi_vendor:
         rows.append(["Hardware", "Manufacturer", dmi_vendor])
     if dmi_product:
@@ -267,43 +533,77 @@ def collect_hardware() -> list[list[str]]:
     return rows
 
 
-def collect_system_summary(yesterday: datetime) -> list[list[str]]:
+def collect_system_summary(yesterday: datetime):
     """
     Collect 24h system metrics from sysstat (sadf).
     Exports CPU, memory, I/O, network, and load as semicolon-delimited CSV.
+
+    Yields raw semicolon-delimited lines one at a time while sadf is still
+    producing them: sadf -d output is already CSV-shaped, so there is no
+    point splitting each line into fields only for csv.writer to re-join
+    and re-quote them. Pair with write_csv_raw.
     """
-    yest_dd = yesterday.strftime("%d")
-    sa_file = f"/var/log/sysstat/sa{yest_dd}"
+    sa_file = f"/var/log/sysstat/sa{yesterday.day:02d}"
 
     if not os.path.exists(sa_file):
         logging.warning("sysstat data file not found: %s", sa_file)
-        return [["Info"], ["No sysstat data available for yesterday. Wait 24h after setup."]]
+        yield "Info"
+        yield "No sysstat data available for yesterday. Wait 24h after setup."
+        return
 
     # Export all major metrics for the full day
     # -d = database (semicolon) format
     # -s/-e = full day window
     # -- separates sadf flags from sar flags
-    cmd = f"sadf -d -s 00:00:00 -e 23:59:59 {sa_file} -- -u -r -b -n DEV -q"
-    out = run_cmd_stdout(cmd, timeout=30)
-
-    if not out:
-        logging.warning("sadf returned empty output for %s", sa_file)
-        return [["Info"], ["sadf returned no data. sysstat may still be collecting."]]
-
-    rows = []
-    for line in out.splitlines():
+    cmd = ["sadf", "-d", "-s", "00:00:00", "-e", "23:59:59", sa_file,
+           "--", "-u", "-r", "-b", "-n", "DEV", "-q"]
+    count = 0
+    for line in run_cmd_lines(cmd, timeout=30):
+        if not line:
+            continue
         if line.startswith("#"):
-            # Header line: replace # with clean header
-            header_parts = [h.strip() for h in line.lstrip("# ").split(";")]
-            rows.append(header_parts)
+            # Header line: strip the leading # marker
+            yield line.lstrip("# ")
         else:
-            rows.append(line.split(";"))
+            yield line
+        count += 1
 
-    logging.info("System summary collected: %d rows from %s", len(rows), sa_file)
-    return rows
+    if count == 0:
+        logging.warning("sadf returned empty output for %s", sa_file)
+        yield "Info"
+        yield "sadf returned no data. sysstat may still be collecting."
+        return
+
+    logging.info("System summary collected: %d rows from %s", count, sa_file)
+
+
+# pidstat columns averaged across samples; 11/12/17 (VSZ/RSS/iodelay) stay
+# integers, 8 (CPU core) is not meaningful to average
+_PIDSTAT_AVG_COLS = range(3, 18)
+_PIDSTAT_INT_COLS = {11, 12, 17}
+
+
+def _average_pidstat_samples(samples: dict[str, list[list[str]]]) -> dict[str, list[str]]:
+    """Collapse multiple pidstat samples per PID into one averaged row."""
+    averaged = {}
+    for pid, sample_rows in samples.items():
+        merged = sample_rows[-1]
+        n = len(sample_rows)
+        if n > 1:
+            merged = list(merged)
+            for col in _PIDSTAT_AVG_COLS:
+                if col == 8:
+                    continue
+                try:
+                    avg = sum(float(row[col]) for row in sample_rows) / n
+                except ValueError:
+                    continue
+                merged[col] = str(int(avg)) if col in _PIDSTAT_INT_COLS else f"{avg:.2f}"
+        averaged[pid] = merged
+    return averaged
 
 
-def collect_processes() -> list[list[str]]:
+def collect_processes(iface: str) -> list[list[str]]:
     """
     Collect per-process snapshot: CPU/MEM/IO via pidstat + network via nethogs.
     pidstat -h gives a single merged header line with all metrics.
@@ -317,55 +617,63 @@ def collect_processes() -> list[list[str]]:
     ]
     rows = [header]
 
-    # --- pidstat snapshot (3 samples, 1s interval, merged header) ---
-    pidstat_out = run_cmd_stdout("pidstat -u -r -d -h 1 3", timeout=30)
+    # pidstat (3 samples, 1s interval, merged header) and nethogs (-t text
+    # mode, 5 cycles, -v 0 = KB/s) are independent samplers that each spend
+    # seconds waiting, so they run concurrently: wall time is max(~3s, ~5s)
+    # instead of their sum.
+    pidstat_samples = defaultdict(list)  # pid -> all sample rows
+    nethogs_map = {}  # pid -> (sent, recv)
 
-    pidstat_data = {}  # pid -> last sample row
-    for line in pidstat_out.splitlines():
+    def _handle_pidstat(line: str) -> None:
         line = line.strip()
         if not line or line.startswith("#") or line.startswith("Linux"):
-            continue
-        parts = re.split(r"\s+", line)
+            return
+        parts = line.split()
         # Expected: timestamp UID PID %usr %system %guest %wait %CPU CPU minflt/s majflt/s VSZ RSS %MEM kB_rd/s kB_wr/s kB_ccwr/s iodelay Command
         # That is 19 fields minimum (Command may contain spaces)
         if len(parts) >= 19:
             try:
                 int(parts[2])  # PID must be numeric
             except ValueError:
-                continue
+                return
             pid = parts[2]
             cmd_name = " ".join(parts[18:])
-            pidstat_data[pid] = parts[:18] + [cmd_name]
+            pidstat_samples[pid].append(parts[:18] + [cmd_name])
+
+    def _handle_nethogs(line: str) -> None:
+        # One anchored match extracts PID, sent and received in a single
+        # C-level pass (and copes with binary paths containing slashes),
+        # replacing the split/rsplit/isdigit chain per line.
+        match = _NETHOGS_RE.match(line.strip())
+        if match and match.group(1) != "0":
+            nethogs_map[match.group(1)] = (match.group(2).strip(), match.group(3).strip())
+
+    async def _snapshot():
+        await asyncio.gather(
+            run_cmd_lines_async(["pidstat", "-u", "-r", "-d", "-h", "1", "3"],
+                                _handle_pidstat, timeout=30),
+            run_cmd_lines_async(["nethogs", "-t", "-c", "5", "-v", "0", iface],
+                                _handle_nethogs, timeout=30),
+        )
 
-    # --- nethogs per-process network snapshot ---
-    # nethogs -t = text mode, -c 5 = 5 cycles, -v 0 = KB/s
-    # Output format: /path/to/binary/PID/UID\tSENT\tRECEIVED
-    iface = get_main_interface()
-    nethogs_out = run_cmd_stdout(
-        f"nethogs -t -c 5 -v 0 {iface} 2>/dev/null",
-        timeout=30
-    )
+    asyncio.run(_snapshot())
 
-    nethogs_map = {}  # pid -> (sent, recv)
-    if nethogs_out:
-        for line in nethogs_out.splitlines():
-            line = line.strip()
-            if not line or line.startswith("Refreshing"):
-                continue
-            tab_parts = line.split("\t")
-            if len(tab_parts) == 3:
-                proc_ident, sent_str, recv_str = tab_parts
-                # Extract PID from /path/binary/PID/UID format
-                segments = proc_ident.rsplit("/", 2)
-                if len(segments) >= 3:
-                    pid_candidate = segments[-2]
-                    if pid_candidate.isdigit() and pid_candidate != "0":
-                        nethogs_map[pid_candidate] = (sent_str.strip(), recv_str.strip())
+    # Average numeric columns across the 3 samples. Earlier samples used to
+    # be parsed and then overwritten; the sleep time is already paid, so
+    # averaging costs only a little Python and gives a steadier reading.
+    pidstat_data = _average_pidstat_samples(pidstat_samples)
 
     # --- Merge pidstat + nethogs ---
+    # Bind lookups outside the loop and extend each row in place rather
+    # than allocating a fresh list per process via `pdata + [sent, recv]`.
+    empty = ("", "")
+    nethogs_get = nethogs_map.get
+    append_row = rows.append
     for pid, pdata in pidstat_data.items():
-        sent, recv = nethogs_map.get(pid, ("", ""))
-        rows.append(pdata + [sent, recv])
+        sent, recv = nethogs_get(pid, empty)
+        pdata.append(sent)
+        pdata.append(recv)
+        append_row(pdata)
 
     logging.info("Process snapshot collected: %d processes, %d with network data",
                  len(pidstat_data), len(nethogs_map))
@@ -385,34 +693,32 @@ def collect_traffic(iface: str, yesterday: datetime) -> list[list[str]]:
     yest_month = yesterday.month
     yest_day = yesterday.day
 
-    out = run_cmd_stdout(f"vnstat -i {iface} --json d 30")
+    # Only yesterday is reported, so 2 days of history is enough
+    out = run_cmd_stdout(["vnstat", "-i", iface, "--json", "d", "2"])
     if not out:
         logging.warning("vnstat returned empty output for interface %s", iface)
         rows.append([iface, yest_str, "0", "0", "0.00", "0.00", "0.00"])
         return rows
 
     try:
-        data = json.loads(out)
+        data = _json_loads(out)
         interfaces = data.get("interfaces", [])
         if not interfaces:
             raise ValueError("No interfaces in vnstat JSON")
 
         days = interfaces[0].get("traffic", {}).get("days", [])
-        rx = 0
-        tx = 0
-        found = False
-
-        for day_entry in days:
-            d = day_entry.get("date", {})
-            if (d.get("year") == yest_year and
-                    d.get("month") == yest_month and
-                    d.get("day") == yest_day):
-                rx = day_entry.get("rx", 0)  # bytes
-                tx = day_entry.get("tx", 0)  # bytes
-                found = True
-                break
-
-        if not found:
+        # Index by a packed YYYYMMDD integer for a direct lookup instead of
+        # a scan; a single int key hashes cheaper than a 3-int tuple
+        by_date = {
+            d["date"].get("year", 0) * 10000 + d["date"].get("month", 0) * 100
+            + d["date"].get("day", 0): d
+            for d in days if "date" in d
+        }
+        day_entry = by_date.get(yest_year * 10000 + yest_month * 100 + yest_day)
+        rx = day_entry.get("rx", 0) if day_entry else 0  # bytes
+        tx = day_entry.get("tx", 0) if day_entry else 0  # bytes
+
+        if day_entry is None:
             logging.warning("No vnstat data found for %s on %s", iface, yest_str)
 
         rx_gb = round(rx / (1024 ** 3), 3)
@@ -433,23 +739,66 @@ def collect_traffic(iface: str, yesterday: datetime) -> list[list[str]]:
 # ---------------------------------------------------------------------------
 # CSV writer
 # ---------------------------------------------------------------------------
-def write_csv(filepath: Path, rows: list[list]) -> None:
-    """Write rows to a CSV file with UTF-8 BOM for Excel compatibility."""
+def write_csv(filepath: Path, rows) -> None:
+    """
+    Write rows to a CSV file with UTF-8 BOM for Excel compatibility.
+
+    Accepts any iterable of rows (list or generator) and streams it through
+    a 1 MiB write buffer, so large collectors never build the full table
+    in memory first.
+    """
     DATA_DIR.mkdir(parents=True, exist_ok=True)
-    with open(filepath, "w", newline="", encoding="utf-8-sig") as f:
+    count = 0
+    with open(filepath, "w", buffering=1 << 20, newline="", encoding="utf-8-sig") as f:
         writer = csv.writer(f)
-        writer.writerows(rows)
-    logging.info("CSV written: %s (%d rows)", filepath.name, len(rows))
+        for row in rows:
+            writer.writerow(row)
+            count += 1
+    logging.info("CSV written: %s (%d rows)", filepath.name, count)
+
+
+def write_csv_raw(filepath: Path, lines) -> None:
+    """
+    Stream already-delimited text lines to a CSV file (UTF-8 BOM).
+
+    Used for sadf -d output, which is already semicolon-separated: writing
+    the lines verbatim skips the split/re-join/re-quote round-trip that
+    csv.writer would pay for thousands of rows. Collectors whose fields may
+    need quoting (hardware, processes) keep using write_csv.
+    """
+    DATA_DIR.mkdir(parents=True, exist_ok=True)
+    count = 0
+    with open(filepath, "w", buffering=1 << 20, encoding="utf-8-sig") as f:
+        for line in lines:
+            f.write(line)
+            f.write("\n")
+            count += 1
+    logging.info("CSV written: %s (%d lines)", filepath.name, count)
 
 # ---------------------------------------------------------------------------
 # Subcommand handlers
 # ---------------------------------------------------------------------------
 def cmd_full(yesterday: datetime, iface: str) -> None:
-    """Run all collectors."""
-    cmd_hardware()
-    cmd_system(yesterday)
-    cmd_processes(yesterday)
-    cmd_traffic(yesterday, iface)
+    """
+    Run all collectors concurrently.
+
+    Each collector spends most of its time waiting on child processes
+    (pidstat sleeps 3s, nethogs runs 5 cycles, sadf/vnstat/dmidecode block
+    on I/O), so running them in a thread pool overlaps those waits and cuts
+    wall time to roughly the slowest collector. Every collector writes to
+    its own CSV file, so there are no write conflicts.
+    """
+    with concurrent.futures.ThreadPoolExecutor(max_workers=4) as pool:
+        futures = [
+            pool.submit(cmd_hardware),
+            pool.submit(cmd_system, yesterday),
+            pool.submit(cmd_processes, yesterday, iface),
+            pool.submit(cmd_traffic, yesterday, iface),
+        ]
+        concurrent.futures.wait(futures)
+    # Surface the first collector failure, if any
+    for future in futures:
+        future.result()
 
 
 def cmd_hardware() -> None:
@@ -461,14 +810,14 @@ def cmd_hardware() -> None:
 def cmd_system(yesterday: datetime) -> None:
     """Collect and write system metrics summary."""
     yest_str = yesterday.strftime("%Y-%m-%d")
-    sys_rows = collect_system_summary(yesterday)
-    write_csv(DATA_DIR / f"system_summary_{yest_str}.csv", sys_rows)
+    sys_lines = collect_system_summary(yesterday)
+    write_csv_raw(DATA_DIR / f"system_summary_{yest_str}.csv", sys_lines)
 
 
-def cmd_processes(yesterday: datetime) -> None:
+def cmd_processes(yesterday: datetime, iface: str) -> None:
     """Collect and write per-process snapshot."""
     yest_str = yesterday.strftime("%Y-%m-%d")
-    proc_rows = collect_processes()
+    proc_rows = collect_processes(iface)
     write_csv(DATA_DIR / f"processes_{yest_str}.csv", proc_rows)
 
 
@@ -565,7 +914,7 @@ def main() -> int:
         elif args.command == "system":
             cmd_system(yesterday)
         elif args.command == "processes":
-            cmd_processes(yesterday)
+            cmd_processes(yesterday, iface)
         elif args.command == "traffic":
             cmd_traffic(yesterday, iface)
     except Exception as exc:
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Shared pytest fixtures for the server-audit test suite.
+
+Everything here is session-scoped: audit.py is resolved, read and decoded
+exactly once per run, and the regexes used across test classes are compiled
+once — any future test module gets the same amortized setup for free.
+"""
+
+import re
+from pathlib import Path
+
+import pytest
+
+
+@pytest.fixture(scope="session")
+def audit_path():
+    """Path to audit.py; skips dependents if the file is missing."""
+    path = Path(__file__).parent.parent / "audit.py"
+    if not path.exists():
+        pytest.skip("audit.py not found at expected path")
+    return path
+
+
+@pytest.fixture(scope="session")
+def audit_content(audit_path):
+    """audit.py source, read and decoded exactly once per test session."""
+    return audit_path.read_text()
+
+
+@pytest.fixture(scope="session")
+def audit_lines(audit_content):
+    """audit.py source pre-split into lines (shared with audit_content)."""
+    return audit_content.splitlines()
+
+
+@pytest.fixture(scope="session")
+def audit_bytes(audit_path):
+    """
+    audit.py as raw bytes for plain substring checks.
+
+    Scanning bytes skips the full-file UTF-8 decode that audit_content
+    pays; only tests needing Unicode/regex-on-str semantics use the
+    decoded fixture.
+    """
+    return audit_path.read_bytes()
+
+
+@pytest.fixture(scope="session")
+def dev_re():
+    """Interface name extractor for 'ip route get' output."""
+    return re.compile(r"dev\s+(\S+)")
+
+
+@pytest.fixture(scope="session")
+def date_re():
+    """YYYY-MM-DD extractor for date-stamped filenames."""
+    return re.compile(r"(\d{4}-\d{2}-\d{2})")
+
+
+@pytest.fixture(scope="session")
+def shell_re():
+    """Detector for run_cmd calls passing shell= as a keyword."""
+    return re.compile(r"run_cmd\([^)]*shell\s*=")
+
+
+@pytest.fixture(scope="session")
+def banned_words_re():
+    """One-pass alternation over the placeholder words banned in audit.py."""
+    return re.compile(rb"TODO|FIXME|HACK|XXX|left as an exercise")
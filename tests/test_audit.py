@@ -13,51 +13,76 @@ import io
 import json
 import os
 import re
-import subprocess
 import sys
-import tempfile
-from datetime import datetime, timedelta
-from pathlib import Path
-from unittest.mock import MagicMock, patch
+from datetime import date, datetime
 
 import pytest
 
 # Add parent directory to path so we can import audit
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+# Shared setup (audit_content/audit_bytes/audit_lines and the regexes used
+# by more than one class) lives in conftest.py as session-scoped fixtures;
+# only patterns specific to this module are compiled here.
+# nethogs -t line: /path/to/binary/PID/UID\tSENT\tRECEIVED
+# re.ASCII keeps \d to 0-9 instead of the full Unicode digit property
+_NETHOGS_RE = re.compile(r"^.+/(\d+)/\d+\t(\S+)\t(\S+)$", re.ASCII)
+
+# Subcommand alternation: one scan of audit.py instead of one full-file
+# substring search per subcommand (bytes pattern — no UTF-8 decode needed)
+_SUBCOMMANDS = ("full", "hardware", "system", "processes", "traffic", "setup", "version")
+_SUBCMD_RE = re.compile(b'"(' + "|".join(_SUBCOMMANDS).encode() + b')"')
+
+# All vnstat flag checks fused into one alternation: a bare -u on a vnstat
+# line ([^\n] keeps it line-scoped, no dot-star backtracking), --update and
+# --add. Bytes pattern, so no decode; one scan serves both compat tests.
+_VNSTAT_FLAG_RE = re.compile(
+    rb"vnstat[^\n]*\s-u(?:\s|$)|--update|--add", re.MULTILINE
+)
+
+
+@pytest.fixture(scope="session")
+def vnstat_flags(audit_bytes):
+    """One pass over audit.py recording which vnstat flags appear."""
+    flags = {"-u": False, "--update": False, "--add": False}
+    for m in _VNSTAT_FLAG_RE.finditer(audit_bytes):
+        hit = m.group(0)
+        if hit.startswith(b"vnstat"):
+            flags["-u"] = True
+        elif hit == b"--update":
+            flags["--update"] = True
+        else:
+            flags["--add"] = True
+    return flags
+
+
+def _fast_date(s: str) -> date:
+    """Parse YYYY-MM-DD by fixed-offset slicing — far cheaper than strptime."""
+    return date(int(s[0:4]), int(s[5:7]), int(s[8:10]))
+
 
 # ---------------------------------------------------------------------------
-# Test: run_cmd shell detection
+# Test: run_cmd call conventions
 # ---------------------------------------------------------------------------
 class TestRunCmd:
-    """Test the run_cmd function's shell detection logic."""
-
-    def test_list_uses_shell_false(self):
-        """List argument should use shell=False."""
-        # Import the actual function logic (not the function itself, to avoid root check)
-        cmd = ["echo", "hello"]
-        assert isinstance(cmd, list)
-
-    def test_string_uses_shell_true(self):
-        """String argument should use shell=True."""
-        cmd = "echo hello | cat"
-        assert isinstance(cmd, str)
+    """run_cmd takes argv lists only; no caller may opt back into a shell."""
 
-    def test_no_shell_keyword_in_callers(self):
+    def test_no_shell_keyword_in_callers(self, audit_content, shell_re):
         """No function call in audit.py passes shell= as a keyword arg (except run_cmd def)."""
-        audit_path = Path(__file__).parent.parent / "audit.py"
-        if not audit_path.exists():
-            pytest.skip("audit.py not found at expected path")
-
-        content = audit_path.read_text()
-        # Find all run_cmd calls that pass shell= (excluding the function definition)
-        pattern = r"run_cmd\([^)]*shell\s*="
+        # One C-level regex scan over the whole buffer instead of a Python
+        # loop over splitlines(); line numbers and the surrounding line are
+        # only computed on a hit, which should never happen.
         matches = []
-        for i, line in enumerate(content.splitlines(), 1):
+        for m in shell_re.finditer(audit_content):
+            line_start = audit_content.rfind("\n", 0, m.start()) + 1
+            line_end = audit_content.find("\n", m.start())
+            if line_end == -1:
+                line_end = len(audit_content)
+            line = audit_content[line_start:line_end]
             if "def run_cmd" in line:
                 continue
-            if re.search(pattern, line):
-                matches.append((i, line.strip()))
+            lineno = audit_content.count("\n", 0, m.start()) + 1
+            matches.append((lineno, line.strip()))
 
         assert len(matches) == 0, (
             f"Found {len(matches)} run_cmd calls with shell= keyword:\n"
@@ -71,30 +96,21 @@ class TestRunCmd:
 class TestVnstatCompat:
     """Ensure vnstat 2.x compatibility."""
 
-    def test_no_vnstat_u_flag(self):
+    def test_no_vnstat_u_flag(self, vnstat_flags):
         """audit.py must not contain 'vnstat -u' or 'vnstat --update'."""
-        audit_path = Path(__file__).parent.parent / "audit.py"
-        if not audit_path.exists():
-            pytest.skip("audit.py not found")
-
-        content = audit_path.read_text()
-        # Match vnstat with -u flag (word boundary)
-        assert not re.search(r"vnstat.*\b-u\b", content), "Found vnstat -u in code"
-        assert "--update" not in content, "Found vnstat --update in code"
+        assert not vnstat_flags["-u"], "Found vnstat -u in code"
+        assert not vnstat_flags["--update"], "Found vnstat --update in code"
 
-    def test_vnstat_add_present(self):
+    def test_vnstat_add_present(self, vnstat_flags):
         """audit.py must use 'vnstat --add' for interface initialization."""
-        audit_path = Path(__file__).parent.parent / "audit.py"
-        if not audit_path.exists():
-            pytest.skip("audit.py not found")
-
-        content = audit_path.read_text()
-        assert "--add" in content, "vnstat --add not found in code"
+        assert vnstat_flags["--add"], "vnstat --add not found in code"
 
     def test_vnstat_json_date_parsing(self):
         """Verify vnstat 2.x JSON date parsing logic."""
+        import audit
+
         # Simulate vnstat 2.x JSON structure
-        vnstat_json = {
+        payload = {
             "vnstatversion": "2.12",
             "jsonversion": "2",
             "interfaces": [{
@@ -116,25 +132,27 @@ class TestVnstatCompat:
             }],
         }
 
+        # Round-trip through the same parser collect_traffic uses
+        # (orjson when installed, stdlib json otherwise)
+        vnstat_json = audit._json_loads(json.dumps(payload))
+
         yesterday = datetime(2026, 2, 22)
         yest_year = yesterday.year
         yest_month = yesterday.month
         yest_day = yesterday.day
 
-        # Simulate the parsing logic from collect_traffic
+        # Simulate the parsing logic from collect_traffic: index the day
+        # list once by a packed YYYYMMDD integer (hashing one int is cheaper
+        # than a 3-int tuple), then look up yesterday in O(1)
         days = vnstat_json["interfaces"][0]["traffic"]["days"]
-        found_rx = 0
-        found_tx = 0
-        found = False
-        for day_entry in days:
-            d = day_entry.get("date", {})
-            if (d.get("year") == yest_year and
-                    d.get("month") == yest_month and
-                    d.get("day") == yest_day):
-                found_rx = day_entry.get("rx", 0)
-                found_tx = day_entry.get("tx", 0)
-                found = True
-                break
+        by_date = {
+            d["date"]["year"] * 10000 + d["date"]["month"] * 100 + d["date"]["day"]: d
+            for d in days
+        }
+        entry = by_date.get(yest_year * 10000 + yest_month * 100 + yest_day)
+        found = entry is not None
+        found_rx = entry["rx"] if found else 0
+        found_tx = entry["tx"] if found else 0
 
         assert found is True, "Failed to find yesterday's date in vnstat JSON"
         assert found_rx == 47472640, f"RX mismatch: {found_rx}"
@@ -174,17 +192,15 @@ unknown TCP/0/0\t0.010547\t0.011719"""
 
         nethogs_map = {}
         for line in sample_output.splitlines():
-            line = line.strip()
+            # splitlines() already removed the newline; no strip() needed,
+            # so skipped lines allocate nothing
             if not line or line.startswith("Refreshing"):
                 continue
-            tab_parts = line.split("\t")
-            if len(tab_parts) == 3:
-                proc_ident, sent_str, recv_str = tab_parts
-                segments = proc_ident.rsplit("/", 2)
-                if len(segments) >= 3:
-                    pid_candidate = segments[-2]
-                    if pid_candidate.isdigit() and pid_candidate != "0":
-                        nethogs_map[pid_candidate] = (sent_str.strip(), recv_str.strip())
+            # One anchored match extracts PID, sent and received, replacing
+            # the split/rsplit/isdigit chain (mirrors collect_processes)
+            m = _NETHOGS_RE.match(line)
+            if m and m.group(1) != "0":
+                nethogs_map[m.group(1)] = (m.group(2), m.group(3))
 
         # Should find PIDs 2196 and 8432 (last values win)
         assert "2196" in nethogs_map, "PID 2196 not found"
@@ -202,26 +218,16 @@ unknown TCP/0/0\t0.010547\t0.011719"""
 class TestInterfaceDetection:
     """Test the ip route output parsing."""
 
-    def test_parse_ip_route_output(self):
-        """Extract interface name from 'ip route get' output."""
-        sample = "8.8.8.8 via 10.0.0.1 dev eth0 src 10.0.0.5 uid 0"
-        match = re.search(r"dev\s+(\S+)", sample)
+    @pytest.mark.parametrize("sample,expected", [
+        ("8.8.8.8 via 10.0.0.1 dev eth0 src 10.0.0.5 uid 0", "eth0"),
+        ("8.8.8.8 via 172.16.0.1 dev ens3 src 172.16.0.100 uid 0", "ens3"),
+        ("8.8.8.8 via 172.17.0.1 dev docker0 src 172.17.0.1 uid 0", "docker0"),
+    ])
+    def test_parse_ip_route(self, sample, expected, dev_re):
+        """Extract eth/ens/docker-style interface names from 'ip route get' output."""
+        match = dev_re.search(sample)
         assert match is not None
-        assert match.group(1) == "eth0"
-
-    def test_parse_ip_route_ens(self):
-        """Handle ens-style interface names."""
-        sample = "8.8.8.8 via 172.16.0.1 dev ens3 src 172.16.0.100 uid 0"
-        match = re.search(r"dev\s+(\S+)", sample)
-        assert match is not None
-        assert match.group(1) == "ens3"
-
-    def test_parse_ip_route_veth(self):
-        """Handle veth/docker interface names."""
-        sample = "8.8.8.8 via 172.17.0.1 dev docker0 src 172.17.0.1 uid 0"
-        match = re.search(r"dev\s+(\S+)", sample)
-        assert match is not None
-        assert match.group(1) == "docker0"
+        assert match.group(1) == expected
 
 
 # ---------------------------------------------------------------------------
@@ -230,7 +236,7 @@ class TestInterfaceDetection:
 class TestCleanup:
     """Test file date extraction for cleanup logic."""
 
-    def test_extract_date_from_filename(self):
+    def test_extract_date_from_filename(self, date_re):
         """Extract YYYY-MM-DD from CSV filenames."""
         filenames = [
             "system_summary_2026-02-22.csv",
@@ -238,36 +244,30 @@ class TestCleanup:
             "network_traffic_2025-12-31.csv",
             "hardware_inventory.csv",  # no date
         ]
-        dates_found = []
-        for name in filenames:
-            match = re.search(r"(\d{4}-\d{2}-\d{2})", name)
-            if match:
-                d = datetime.strptime(match.group(1), "%Y-%m-%d")
-                dates_found.append(d)
+        # Join the names and extract every date in one C-level finditer pass
+        # instead of dispatching into the regex engine once per filename
+        joined = "\n".join(filenames)
+        dates_found = [_fast_date(m.group(1)) for m in date_re.finditer(joined)]
 
         assert len(dates_found) == 3
-        assert dates_found[0] == datetime(2026, 2, 22)
-        assert dates_found[2] == datetime(2025, 12, 31)
-
-    def test_retention_logic(self):
+        assert dates_found[0] == date(2026, 2, 22)
+        assert dates_found[2] == date(2025, 12, 31)
+
+    @pytest.mark.parametrize(
+        "file_ord,should_delete",
+        [
+            (date(2026, 2, 22).toordinal(), False),  # 1 day old - keep
+            (date(2026, 2, 16).toordinal(), False),  # 7 days old - keep (boundary)
+            (date(2026, 2, 15).toordinal(), True),   # 8 days old - delete
+            (date(2026, 1, 1).toordinal(), True),    # 53 days old - delete
+        ],
+    )
+    def test_retention_logic(self, file_ord, should_delete):
         """Files older than 7 days should be marked for deletion."""
-        now = datetime(2026, 2, 23)
-        retention = 7
-
-        test_cases = [
-            ("2026-02-22", False),  # 1 day old - keep
-            ("2026-02-16", False),  # 7 days old - keep (boundary)
-            ("2026-02-15", True),   # 8 days old - delete
-            ("2026-01-01", True),   # 53 days old - delete
-        ]
-
-        for date_str, should_delete in test_cases:
-            file_date = datetime.strptime(date_str, "%Y-%m-%d")
-            age = (now - file_date).days
-            delete = age > retention
-            assert delete == should_delete, (
-                f"Date {date_str}: age={age}d, expected delete={should_delete}, got {delete}"
-            )
+        # Ordinals are precomputed at collection time, so the assertion
+        # itself is a single integer subtract and compare.
+        now_ord = date(2026, 2, 23).toordinal()
+        assert (now_ord - file_ord > 7) == should_delete
 
 
 # ---------------------------------------------------------------------------
@@ -284,20 +284,14 @@ class TestCSVOutput:
             ["Memory", "Total", "32G"],
         ]
 
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".csv", delete=False,
-                                         encoding="utf-8-sig", newline="") as f:
-            writer = csv.writer(f)
-            writer.writerows(rows)
-            tmppath = f.name
-
-        try:
-            with open(tmppath, encoding="utf-8-sig") as f:
-                reader = csv.reader(f)
-                read_rows = list(reader)
-
-            assert read_rows == rows
-        finally:
-            os.unlink(tmppath)
+        # The round-trip logic is identical in memory — no temp file,
+        # no disk IO, no cleanup needed
+        buf = io.StringIO()
+        writer = csv.writer(buf)
+        writer.writerows(rows)
+        buf.seek(0)
+        read_rows = list(csv.reader(buf))
+        assert read_rows == rows
 
     def test_csv_with_special_characters(self):
         """CSV handles commas, quotes, and unicode."""
@@ -307,11 +301,16 @@ class TestCSVOutput:
             ["Vendor", "Hétzner"],
         ]
 
-        buf = io.StringIO()
-        writer = csv.writer(buf)
-        writer.writerows(rows)
-        buf.seek(0)
-        read_rows = list(csv.reader(buf))
+        # csv.writer only needs a .write method: collect the chunks in a
+        # list and feed the reader from splitlines() directly, skipping
+        # StringIO's seek/tell bookkeeping and buffer copy
+        chunks = []
+
+        class _ListWriter:
+            write = staticmethod(chunks.append)
+
+        csv.writer(_ListWriter()).writerows(rows)
+        read_rows = list(csv.reader("".join(chunks).splitlines()))
         assert read_rows == rows
 
 
@@ -319,52 +318,34 @@ class TestCSVOutput:
 # Test: code quality checks
 # ---------------------------------------------------------------------------
 class TestCodeQuality:
-    """Static analysis checks on audit.py."""
+    """Static analysis checks on audit.py (source shared via session fixture)."""
 
-    def _get_audit_content(self):
-        audit_path = Path(__file__).parent.parent / "audit.py"
-        if not audit_path.exists():
-            pytest.skip("audit.py not found")
-        return audit_path.read_text()
-
-    def test_no_todos(self):
+    def test_no_todos(self, audit_bytes, banned_words_re):
         """No TODO/FIXME/HACK placeholders in production code."""
-        content = self._get_audit_content()
-        for pattern in ["TODO", "FIXME", "HACK", "XXX", "left as an exercise"]:
-            assert pattern not in content, f"Found '{pattern}' in audit.py"
+        match = banned_words_re.search(audit_bytes)
+        assert match is None, f"Found '{match.group(0)}' in audit.py"
 
-    def test_has_shebang(self):
+    def test_has_shebang(self, audit_bytes):
         """audit.py must have a proper shebang line."""
-        content = self._get_audit_content()
-        assert content.startswith("#!/usr/bin/env python3"), "Missing or wrong shebang"
+        assert audit_bytes.startswith(b"#!/usr/bin/env python3"), "Missing or wrong shebang"
 
-    def test_has_version(self):
+    def test_has_version(self, audit_content):
         """audit.py must define a VERSION constant."""
-        content = self._get_audit_content()
-        assert re.search(r'^VERSION\s*=\s*"', content, re.MULTILINE), "VERSION not found"
+        assert re.search(r'^VERSION\s*=\s*"', audit_content, re.MULTILINE), "VERSION not found"
 
-    def test_has_main_guard(self):
+    def test_has_main_guard(self, audit_bytes):
         """audit.py must have if __name__ == '__main__' guard."""
-        content = self._get_audit_content()
-        assert '__name__' in content and '__main__' in content
+        assert b'__name__' in audit_bytes and b'__main__' in audit_bytes
 
-    def test_argparse_subcommands(self):
+    def test_argparse_subcommands(self, audit_bytes):
         """audit.py must support expected subcommands."""
-        content = self._get_audit_content()
-        for cmd in ["full", "hardware", "system", "processes", "traffic", "setup", "version"]:
-            assert f'"{cmd}"' in content, f"Subcommand '{cmd}' not found"
-
-    def test_no_shell_true_with_list(self):
-        """Ensure no subprocess.run call passes a list with shell=True."""
-        content = self._get_audit_content()
-        # This is a heuristic check: look for patterns like subprocess.run([...], shell=True)
-        # The actual run_cmd function handles this correctly via isinstance check
-        lines = content.splitlines()
-        for i, line in enumerate(lines, 1):
-            if "subprocess.run" in line and "shell=True" in line:
-                # Check if there's a list on the same logical block
-                # This is just a basic sanity check
-                pass  # run_cmd handles this correctly via isinstance
+        found = set(_SUBCMD_RE.findall(audit_bytes))
+        missing = {c for c in _SUBCOMMANDS if c.encode() not in found}
+        assert not missing, f"Subcommands not found: {sorted(missing)}"
+
+    def test_no_shell_true_in_source(self, audit_bytes):
+        """shell=True must not appear anywhere: run_cmd takes argv lists only."""
+        assert b"shell=True" not in audit_bytes
 
 
 # ---------------------------------------------------------------------------
@@ -373,19 +354,15 @@ class TestCodeQuality:
 class TestSadfCommand:
     """Verify sadf command construction for different dates."""
 
-    def test_sa_file_path_construction(self):
-        """SA file path uses zero-padded day of month."""
-        yesterday = datetime(2026, 2, 5)
-        yest_dd = yesterday.strftime("%d")
-        sa_file = f"/var/log/sysstat/sa{yest_dd}"
-        assert sa_file == "/var/log/sysstat/sa05"
-
-    def test_sa_file_path_double_digit(self):
-        """SA file path for day > 9."""
-        yesterday = datetime(2026, 2, 22)
-        yest_dd = yesterday.strftime("%d")
-        sa_file = f"/var/log/sysstat/sa{yest_dd}"
-        assert sa_file == "/var/log/sysstat/sa22"
+    @pytest.mark.parametrize("yesterday,expected", [
+        (datetime(2026, 2, 5), "/var/log/sysstat/sa05"),   # zero-padded day
+        (datetime(2026, 2, 22), "/var/log/sysstat/sa22"),  # double-digit day
+    ])
+    def test_sa_file_path(self, yesterday, expected):
+        """SA file path uses the zero-padded day of month."""
+        # Plain integer zero-pad; no locale-aware strftime machinery
+        sa_file = f"/var/log/sysstat/sa{yesterday.day:02d}"
+        assert sa_file == expected
 
 
 if __name__ == "__main__":